@@ -10,8 +10,16 @@ import re
 import csv
 import json
 import time
+import asyncio
+import atexit
+import bisect
+import functools
+import heapq
+import queue
 import threading
-from collections import OrderedDict
+from collections import Counter, OrderedDict, deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from itertools import chain
 from datetime import datetime
 try:
     from zoneinfo import ZoneInfo
@@ -22,15 +30,13 @@ import tkinter as tk
 from tkinter import ttk, messagebox
 from tkinter.scrolledtext import ScrolledText
 import tkinter.font as tkfont
-from queue import Queue, Empty
 from threading import Lock
 
 # Pillow for screenshot (optional)
 try:
-    from PIL import ImageGrab, Image
+    from PIL import ImageGrab
 except Exception:
     ImageGrab = None
-    Image = None
 
 # ---------- lmstudio ----------
 try:
@@ -38,6 +44,21 @@ try:
 except Exception:
     lms = None
 
+@functools.lru_cache(maxsize=8)
+def _get_llm(name: str):
+    """Model handle per model name, created once and reused by every request."""
+    return lms.llm(name) if name else lms.llm()
+
+@functools.lru_cache(maxsize=32)
+def cfg_key(temperature: float, max_tokens: int) -> tuple:
+    """
+    Prediction config as an immutable (name, value) tuple, shared by reference by
+    every task of a send and usable as a cache key; dict(key) gives the lmstudio config.
+    """
+    key = (("temperature", temperature),)
+    if max_tokens > 0: key += (("maxTokens", max_tokens),)
+    return key
+
 # ---------- Config / Disabled langs ----------
 DISABLED_LANGS = {"es", "fr"}  # スペイン語とフランス語を無効化
 DEFAULT_CONFIG = {
@@ -46,8 +67,17 @@ DEFAULT_CONFIG = {
     #"MODEL_NAME": "openai/gpt-oss-20b",
     "TEMPERATURE": 0.1,
     "MAX_TOKENS": 0,  # 0=auto → omit maxTokens (server default)
+    "WORD_SORT_TOP_K": 0,  # >0: large word.csv only fully sorts its top-K rows
+    "SENTENCE_PARALLEL": 2,  # max sentence requests in flight (read at startup)
+    "WORD_PARALLEL": 4,      # max word requests in flight (read at startup)
+    "WORD_BATCH_SIZE": 8,    # new words asked in one JSON request; 1 = one word per request
+    "WORD_BATCH_WAIT_MS": 100,  # how long the first new word waits for others to join its batch
+    "WORD_Q_MAX": 64,        # new words staged for batching at most; further words wait (read at startup)
 }
-CONFIG_PATH = os.path.join(os.path.dirname(__file__), "simple_live_translator.config.json")
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+LOG_DIR = os.path.join(BASE_DIR, "log")
+FLASH_PNG_DIR = os.path.join(LOG_DIR, "FlashPNG")
+CONFIG_PATH = os.path.join(BASE_DIR, "simple_live_translator.config.json")
 
 # ---------- colors ----------
 COLOR_INPUT = "#FFFFFF"
@@ -60,33 +90,139 @@ COLOR_DIM   = "#AAAAAA"
 BG_DISPLAY  = "#000000"
 
 # ---------- prompts ----------
-def prompt_ja(text: str) -> str: return f"簡潔に日本語に訳した文だけ記載してください。\n「{text}」"
-def prompt_en(text: str) -> str: return f"簡潔に英語に訳した文だけ記載してください。\n「{text}」"
-def prompt_es(text: str) -> str: return f"簡潔にスペイン語に訳した文だけ記載してください。\n「{text}」"
-def prompt_fr(text: str) -> str: return f"簡潔にフランス語に訳した文だけ記載してください。\n「{text}」"
+# one template per prompt kind, built once at import; "{}" is the German text/word
+_PROMPT_TEMPLATES = {
+    "ja":      "簡潔に日本語に訳した文だけ記載してください。\n「{}」",
+    "en":      "簡潔に英語に訳した文だけ記載してください。\n「{}」",
+    "es":      "簡潔にスペイン語に訳した文だけ記載してください。\n「{}」",
+    "fr":      "簡潔にフランス語に訳した文だけ記載してください。\n「{}」",
+    "en+ja":   "簡潔に英語と日本語に訳した文だけを次の形式で記載してください。\nEN: 英訳\nJA: 和訳\n「{}」",
+    "word_en": "簡潔にこのドイツ語に最も近い英語をセミコロン区切りの形式で3つ列挙してください。\n「{}」",
+    "word_ja": "簡潔にこのドイツ語に最も近い日本語語をセミコロン区切りの形式で3つ列挙してください。\n「{}」",
+    "words":   "次のドイツ語の各単語について、最も近い英語と日本語をそれぞれセミコロン区切りの形式で3つ列挙し、"
+               "次の形式の JSON だけを出力してください。\n"
+               "{{\"単語\": {{\"en\": \"英語; 英語; 英語\", \"ja\": \"日本語; 日本語; 日本語\"}}}}\n{}",
+}
 
-def prompt_word_en(word: str) -> str:
-    return f"簡潔にこのドイツ語に最も近い英語をセミコロン区切りの形式で3つ列挙してください。\n「{word}」"
-def prompt_word_ja(word: str) -> str:
-    return f"簡潔にこのドイツ語に最も近い日本語語をセミコロン区切りの形式で3つ列挙してください。\n「{word}」"
+# re-sent text and recurring words reuse the built prompt string
+@functools.lru_cache(maxsize=256)
+def prompt_for(kind: str, text: str) -> str: return _PROMPT_TEMPLATES[kind].format(text)
+
+def prompt_ja(text: str) -> str: return prompt_for("ja", text)
+def prompt_en(text: str) -> str: return prompt_for("en", text)
+def prompt_es(text: str) -> str: return prompt_for("es", text)
+def prompt_fr(text: str) -> str: return prompt_for("fr", text)
+def prompt_en_ja(text: str) -> str: return prompt_for("en+ja", text)
+
+def prompt_word_en(word: str) -> str: return prompt_for("word_en", word)
+def prompt_word_ja(word: str) -> str: return prompt_for("word_ja", word)
+def prompt_words_batch(words) -> str: return prompt_for("words", json.dumps(list(words), ensure_ascii=False))
 
 # ---------- utils ----------
 PUNCT_STRIP = ".,!?;:\"“”„()[]{}<>/\\|—–-+*=~_^`…，。！？；：『』「」【】（）«»"
 
+# compiled once; used on every LLM response / file save
+# "<|channel|>final<|message|>" etc. all end in this, so its last occurrence is the cut point
+_FINAL_TOKEN  = "final<|message|>"
+_LEAD_TAGS_RE = re.compile(r'^\s*(?:<\|[^|]+\|>)+', re.S)
+_SANITIZE_RE  = re.compile(r'[^A-Za-z0-9_\-\.]')
+# "EN:" / "JA:" heads, also with a full-width colon and markdown emphasis ("**JA：**")
+_EN_HEAD_RE   = re.compile(r'^\s*[*_]*\s*EN\s*[*_]*\s*[:：]\s*[*_]*\s*')
+_JA_SPLIT_RE  = re.compile(r'^\s*[*_]*\s*JA\s*[*_]*\s*[:：]\s*[*_]*\s*', re.M)
+
 def tz_now_jst():
     if ZoneInfo is not None:
         try: return datetime.now(ZoneInfo("Asia/Tokyo"))
         except Exception: pass
     return datetime.now()
 
+_ENSURED_DIRS = set()  # directories already created by ensure_dir
+_ENSURED_LOCK = Lock()
+
 def ensure_dir(p: str):
-    os.makedirs(p, exist_ok=True)
+    if p in _ENSURED_DIRS: return
+    with _ENSURED_LOCK:
+        os.makedirs(p, exist_ok=True)
+        _ENSURED_DIRS.add(p)
 
 def write_text(path: str, text: str):
     ensure_dir(os.path.dirname(path))
     with open(path, "w", encoding="utf-8", newline="") as f:
         f.write("" if text is None else str(text))
 
+class LogSpool:
+    """
+    Session-long append handles for the request/response logs, one file per
+    (yyyyMMdd, kind) under root/yyyyMMdd/. Entries are buffered and written to
+    disk by flush_all(); when a file cannot be opened the entry falls back to
+    its own {ts12}_{kind}.log file as before.
+    """
+    def __init__(self, root: str):
+        self.root = root
+        self._fhs = {}  # (ymd, kind) -> open text handle
+        self._lock = Lock()
+
+    def write(self, kind: str, ts14: str, text: str):
+        ymd = ts14[:8]
+        text = "" if text is None else str(text)
+        with self._lock:
+            fh = self._fhs.get((ymd, kind)) or self._open(ymd, kind)
+            if fh is not None:
+                fh.write(f"===== {ts14} =====\n{text}\n\n")
+                return
+        write_text(os.path.join(self.root, ymd, f"{ts14[2:]}_{kind}.log"), text)
+
+    def _open(self, ymd: str, kind: str):
+        # caller holds self._lock; a new day closes the previous day's file of this kind
+        for key in [k for k in self._fhs if k[1] == kind]:
+            try: self._fhs.pop(key).close()
+            except Exception: pass
+        try:
+            day_dir = os.path.join(self.root, ymd)
+            ensure_dir(day_dir)
+            fh = open(os.path.join(day_dir, f"{kind}.log"), "a", encoding="utf-8", newline="", buffering=1 << 16)
+        except Exception as e:
+            print("log open failed:", e); return None
+        self._fhs[(ymd, kind)] = fh
+        return fh
+
+    def flush_all(self):
+        with self._lock:
+            for fh in self._fhs.values():
+                try: fh.flush()
+                except Exception as e: print("log flush failed:", e)
+
+    def close_all(self):
+        with self._lock:
+            for fh in self._fhs.values():
+                try: fh.close()
+                except Exception: pass
+            self._fhs.clear()
+
+class DaemonPool:
+    """
+    Fixed-size pool of daemon worker threads for blocking LLM calls, usable with
+    loop.run_in_executor. Unlike ThreadPoolExecutor (whose workers are joined at
+    interpreter exit) a call stalled on the server never keeps the process alive
+    after the window is closed.
+    """
+    def __init__(self, max_workers: int, name: str = "llm"):
+        self._q = queue.SimpleQueue()
+        for i in range(max(1, max_workers)):
+            threading.Thread(target=self._work, name=f"{name}-{i}", daemon=True).start()
+
+    def submit(self, fn, *args, **kwargs) -> Future:
+        fut = Future()
+        self._q.put((fut, fn, args, kwargs))
+        return fut
+
+    def _work(self):
+        while True:
+            fut, fn, args, kwargs = self._q.get()
+            if not fut.set_running_or_notify_cancel(): continue
+            try: fut.set_result(fn(*args, **kwargs))
+            except BaseException as e: fut.set_exception(e)
+
 def append_csv_row(path: str, row: list, header: list = None):
     ensure_dir(os.path.dirname(path))
     need_header = not os.path.exists(path)
@@ -96,34 +232,65 @@ def append_csv_row(path: str, row: list, header: list = None):
         w.writerow(row)
 
 def extract_final_message_only(s: str) -> str:
-    tokens = ["final<|message|>", "<|channel|>final<|message|>", "<|start|>assistant<|channel|>final<|message|>"]
-    last_idx = -1; last_tok = None
-    for t in tokens:
-        i = s.rfind(t)
-        if i > last_idx: last_idx, last_tok = i, t
-    out = s[last_idx + len(last_tok):] if last_idx != -1 else s
-    out = re.sub(r'^\s*(?:<\|[^|]+\|>)+', '', out, flags=re.S)
+    last_idx = s.rfind(_FINAL_TOKEN)
+    out = s[last_idx + len(_FINAL_TOKEN):] if last_idx != -1 else s
+    out = _LEAD_TAGS_RE.sub('', out)
     return out.strip()
 
+def split_en_ja(text: str):
+    """Split an "EN: ...\nJA: ..." response into (en, ja); ja is "" when no JA head is found."""
+    parts = _JA_SPLIT_RE.split(text, maxsplit=1)
+    en = _EN_HEAD_RE.sub('', parts[0]).strip()
+    ja = parts[1].strip() if len(parts) > 1 else ""
+    return en, ja
+
+def _candidates(v) -> str:
+    if isinstance(v, (list, tuple)):
+        v = "; ".join(str(x).strip() for x in v if str(x).strip())
+    return v.strip() if isinstance(v, str) else ""
+
+def parse_words_batch(text: str, words) -> dict:
+    """
+    Parse the JSON answer to prompt_words_batch into {word: (en, ja)}.
+    Words missing from the answer, or without both EN and JA, are left out.
+    """
+    start, end = text.find("{"), text.rfind("}")
+    if start < 0 or end < start: return {}
+    try: data = json.loads(text[start:end + 1])
+    except ValueError: return {}
+    if not isinstance(data, dict): return {}
+    folded = {str(k).strip().casefold(): v for k, v in data.items()}
+    out = {}
+    for w in words:
+        entry = data.get(w, folded.get(w.casefold()))
+        if not isinstance(entry, dict): continue
+        en, ja = _candidates(entry.get("en")), _candidates(entry.get("ja"))
+        if en and ja: out[w] = (en, ja)
+    return out
+
+# whitespace-separated tokens, the same split as str.split()
+_TOKEN_RE = re.compile(r"\S+")
+
+@functools.lru_cache(maxsize=4096)
 def normalize_word(w: str) -> str:
+    # cached per raw spelling: running text repeats the same tokens
     w = w.strip(PUNCT_STRIP)
     if not w: return ""
     return w[:1].upper() + w[1:].lower()
 
 def tokenize_german(text: str):
-    seen = set(); ordered = []
-    for tok in text.split():
-        n = normalize_word(tok)
-        if n and n not in seen:
-            seen.add(n); ordered.append(n)
-    return ordered
+    # yields every occurrence in text order (Counter it for multiplicities),
+    # without building a token list first
+    for m in _TOKEN_RE.finditer(text):
+        w = normalize_word(m.group())
+        if w: yield w
 
 def sanitize_filename(name: str) -> str:
     # Replace problematic chars with _
-    return re.sub(r'[^A-Za-z0-9_\-\.]', '_', name)
+    return _SANITIZE_RE.sub('_', name)
 
 # ---------- word.csv ----------
-WORD_CSV_PATH = os.path.join(os.path.dirname(__file__), "log", "word.csv")
+WORD_CSV_PATH = os.path.join(LOG_DIR, "word.csv")
 # New header includes 'skip' as 5th column (0/1)
 WORD_HEADER   = ["word", "en", "ja", "count", "skip"]
 
@@ -131,66 +298,83 @@ def load_word_db():
     """
     Supports both old 4-column format and new 5-column format.
     Returns dict: {word: {"en":..., "ja":..., "count":int, "skip":0/1}}
+    Rows are read lazily; only the header decides how they are parsed.
     """
     db = {}
     if not os.path.exists(WORD_CSV_PATH): return db
     with open(WORD_CSV_PATH, "r", encoding="utf-8", newline="") as f:
-        rows = list(csv.reader(f))
-    if not rows: return db
-    header = [c.strip().lower() for c in rows[0]]
-    # 2-column minimal header ["word","count"] legacy
-    if header == ["word","count"]:
-        for row in rows[1:]:
-            if not row: continue
-            w = row[0].strip()
-            cnt = int(row[1]) if len(row)>1 and row[1].isdigit() else 0
-            db[w] = {"en":"", "ja":"", "count":cnt, "skip":0}
-    # old 4-col format
-    elif header[:4] == ["word","en","ja","count"]:
-        for row in rows[1:]:
+        reader = csv.reader(f)
+        header = next(reader, None)
+        if not header: return db
+        header = [c.strip().lower() for c in header]
+        # 2-column minimal header ["word","count"] legacy
+        legacy_counts = header == ["word","count"]
+        # 4/5-col formats only accept 0/1 in the skip column; the fallback accepts any digits
+        strict_skip = header[:4] == ["word","en","ja","count"]
+        for row in reader:
             if not row: continue
             w = row[0].strip()
+            if legacy_counts:
+                cnt = int(row[1]) if len(row)>1 and row[1].isdigit() else 0
+                db[w] = {"en":"", "ja":"", "count":cnt, "skip":0}
+                continue
             en = row[1].strip() if len(row)>1 else ""
             ja = row[2].strip() if len(row)>2 else ""
             try: cnt = int(row[3]) if len(row)>3 else 0
             except Exception: cnt = 0
-            # if skip column exists use it, else 0
-            try: sk = int(row[4]) if len(row)>4 and row[4] in ("0","1") else 0
-            except Exception: sk = 0
-            db[w] = {"en":en, "ja":ja, "count":cnt, "skip":sk}
-    # new 5-col format
-    elif header[:5] == ["word","en","ja","count","skip"]:
-        for row in rows[1:]:
-            if not row: continue
-            w = row[0].strip()
-            en = row[1].strip() if len(row)>1 else ""
-            ja = row[2].strip() if len(row)>2 else ""
-            try: cnt = int(row[3]) if len(row)>3 else 0
-            except Exception: cnt = 0
-            try: sk = int(row[4]) if len(row)>4 and str(row[4]).strip().isdigit() else 0
-            except Exception: sk = 0
-            db[w] = {"en":en, "ja":ja, "count":cnt, "skip":sk}
-    else:
-        # fallback: try to parse rows len>=2
-        for row in rows[1:]:
-            if not row: continue
-            w = row[0].strip()
-            en = row[1].strip() if len(row)>1 else ""
-            ja = row[2].strip() if len(row)>2 else ""
-            try: cnt = int(row[3]) if len(row)>3 else 0
-            except Exception: cnt = 0
-            try: sk = int(row[4]) if len(row)>4 and str(row[4]).strip().isdigit() else 0
-            except Exception: sk = 0
+            sk = 0
+            if len(row) > 4:
+                ok = row[4] in ("0","1") if strict_skip else row[4].strip().isdigit()
+                if ok: sk = int(row[4])
             db[w] = {"en":en, "ja":ja, "count":cnt, "skip":sk}
     return db
 
-def save_word_db(db: dict):
-    ensure_dir(os.path.dirname(WORD_CSV_PATH))
-    with open(WORD_CSV_PATH, "w", encoding="utf-8", newline="") as f:
+def has_translation(info: dict) -> bool:
+    """True when a DB entry holds usable (non-error) EN and JA candidates."""
+    en = info.get("en", ""); ja = info.get("ja", "")
+    return bool(en and ja) and not en.startswith("(error)") and not ja.startswith("(error)")
+
+# above this many words, save_word_db_full(top_k>0) only orders the top-K rows
+WORD_SORT_FULL_LIMIT = 5000
+
+def _word_count(info: dict) -> int:
+    return int(info.get("count", 0))
+
+def _word_row(word: str, info: dict) -> list:
+    return [word, info.get("en",""), info.get("ja",""), int(info.get("count",0)), int(info.get("skip",0))]
+
+def write_word_csv(path: str, db: dict, top_k: int = 0):
+    """
+    Write db to path ordered by count desc then word.
+    With top_k>0 and a DB larger than WORD_SORT_FULL_LIMIT, only the top_k rows
+    are ordered (heap select) and the rest follow unsorted.
+    """
+    key = lambda x: (-x[1].get("count",0), x[0])
+    if top_k > 0 and len(db) > WORD_SORT_FULL_LIMIT:
+        head = heapq.nsmallest(top_k, db.items(), key=key)
+        head_words = {word for word, _ in head}
+        rows = chain(head, ((word, info) for word, info in db.items() if word not in head_words))
+    else:
+        rows = sorted(db.items(), key=key)
+    ensure_dir(os.path.dirname(path))
+    with open(path, "w", encoding="utf-8", newline="") as f:
         w = csv.writer(f); w.writerow(WORD_HEADER)
-        for word, info in sorted(db.items(), key=lambda x: (-x[1].get("count",0), x[0])):
-            skip_val = int(info.get("skip",0))
-            w.writerow([word, info.get("en",""), info.get("ja",""), int(info.get("count",0)), skip_val])
+        for word, info in rows:
+            w.writerow(_word_row(word, info))
+
+def save_word_db_full(db: dict, top_k: int = 0):
+    """Rewrite word.csv atomically (temp file + os.replace)."""
+    tmp = WORD_CSV_PATH + ".tmp"
+    write_word_csv(tmp, db, top_k)
+    os.replace(tmp, WORD_CSV_PATH)
+
+def append_word_delta(word: str, info: dict):
+    """Append one changed entry to word.csv (no sort; load_word_db lets later rows win)."""
+    append_csv_row(WORD_CSV_PATH, _word_row(word, info), header=WORD_HEADER)
+
+# ---------- archive.csv ----------
+ARCHIVE_CSV_PATH = os.path.join(LOG_DIR, "archive.csv")
+ARCHIVE_HEADER   = ["Time","Germany","Japanese","English","Spanish","French"]
 
 # ---------- Display window ----------
 class DisplayWindow(tk.Toplevel):
@@ -335,24 +519,38 @@ class WordFlash(tk.Toplevel):
         self.lbl_count = tk.Label(self, text="", bg=BG_DISPLAY, fg=COLOR_INPUT, font=self.bold)
         self.lbl_de    = tk.Label(self, text="", bg=BG_DISPLAY, fg=COLOR_INPUT, font=self.bold)
 
-        # EN/JA scroll areas (Canvas)
-        self.en_canvas = tk.Canvas(self, width=self.WIDTH-40, height=40, bg=BG_DISPLAY, highlightthickness=0)
-        self.ja_canvas = tk.Canvas(self, width=self.WIDTH-40, height=40, bg=BG_DISPLAY, highlightthickness=0)
+        # EN/JA rows: fixed-size slots holding either a static Label (text fits)
+        # or a scrolling Canvas (marquee)
+        self.en_slot = tk.Frame(self, width=self.WIDTH-40, height=40, bg=BG_DISPLAY)
+        self.ja_slot = tk.Frame(self, width=self.WIDTH-40, height=40, bg=BG_DISPLAY)
+        self.en_slot.pack_propagate(False); self.ja_slot.pack_propagate(False)
+        self.en_canvas = tk.Canvas(self.en_slot, width=self.WIDTH-40, height=40, bg=BG_DISPLAY, highlightthickness=0)
+        self.ja_canvas = tk.Canvas(self.ja_slot, width=self.WIDTH-40, height=40, bg=BG_DISPLAY, highlightthickness=0)
+        self.en_var = tk.StringVar(self); self.ja_var = tk.StringVar(self)
+        self.en_label = tk.Label(self.en_slot, textvariable=self.en_var, bg=BG_DISPLAY, fg=COLOR_EN, font=self.bold)
+        self.ja_label = tk.Label(self.ja_slot, textvariable=self.ja_var, bg=BG_DISPLAY, fg=COLOR_JA, font=self.bold)
 
         self.lbl_count.pack(pady=(18,6))
         self.lbl_de.pack(pady=2)
-        self.en_canvas.pack(pady=2)
-        self.ja_canvas.pack(pady=2)
+        self.en_slot.pack(pady=2)
+        self.ja_slot.pack(pady=2)
+        self.en_label.pack(expand=True)
+        self.ja_label.pack(expand=True)
 
         # text ids and timers
         self._en_text_id = None
         self._ja_text_id = None
         self._en_timer = None
         self._ja_timer = None
+        # tick callbacks of running marquees, kept so they can resume after a pause
+        self._ticks = {"en": None, "ja": None}
 
         self.font_en = self.bold
         self.font_ja = self.bold
 
+        # marquees pause while the window is hidden; resume when it is mapped again
+        self.bind("<Map>", self._on_map)
+
     def on_close(self): self.withdraw()
 
     def show(self):
@@ -364,7 +562,13 @@ class WordFlash(tk.Toplevel):
         except Exception:
             pass
 
+    def _on_map(self, event):
+        if event.widget is not self: return
+        if self._ticks["en"] and not self._en_timer: self._ticks["en"]()
+        if self._ticks["ja"] and not self._ja_timer: self._ticks["ja"]()
+
     def _clear_marquee(self, canvas, which):
+        self._ticks[which] = None
         if which == "en" and self._en_timer:
             try: self.after_cancel(self._en_timer)
             except Exception: pass
@@ -377,34 +581,43 @@ class WordFlash(tk.Toplevel):
 
     def _start_marquee(self, canvas, text, color, font, which):
         self._clear_marquee(canvas, which)
-        # draw once to measure
-        tid = canvas.create_text(0, 20, text=text, anchor="w", fill=color, font=font)
-        bbox = canvas.bbox(tid)
-        text_w = (bbox[2]-bbox[0]) if bbox else 0
+        label, var = (self.en_label, self.en_var) if which == "en" else (self.ja_label, self.ja_var)
+        text_w = font.measure(text)
         area_w = int(canvas.cget("width"))
 
         if text_w <= area_w:
-            # center static
-            canvas.coords(tid, (area_w-text_w)//2, 20)
-            if which == "en": self._en_text_id = tid
-            else: self._ja_text_id = tid
+            # fits: centered static Label, no canvas item and no timer
+            canvas.pack_forget()
+            var.set(text)
+            label.pack(expand=True)
+            if which == "en": self._en_text_id = None
+            else: self._ja_text_id = None
             return
 
+        label.pack_forget()
+        var.set("")
+        canvas.pack()
         # place starting at right edge + small gap
         x = area_w
-        canvas.coords(tid, x, 20)
+        tid = canvas.create_text(x, 20, text=text, anchor="w", fill=color, font=font)
         if which == "en": self._en_text_id = tid
         else: self._ja_text_id = tid
 
         def tick():
             nonlocal x
-            x -= self.SCROLL_DX
-            canvas.coords(tid, x, 20)
-            if x + text_w < 0:
-                x = area_w  # reset to right
-            timer = self.after(self.SCROLL_MS, tick)
+            if self.state() in ("withdrawn", "iconic"):
+                timer = None  # paused; <Map> restarts it
+            else:
+                x -= self.SCROLL_DX
+                if x + text_w < 0:
+                    x = area_w  # reset to right
+                    canvas.coords(tid, x, 20)
+                else:
+                    canvas.move(tid, -self.SCROLL_DX, 0)
+                timer = self.after(self.SCROLL_MS, tick)
             if which == "en": self._en_timer = timer
             else: self._ja_timer = timer
+        self._ticks[which] = tick
         tick()
 
     def show_word(self, count:int, de:str, en:str, ja:str, starred:bool=False):
@@ -418,6 +631,9 @@ class WordFlash(tk.Toplevel):
 
 # ---------- Main app ----------
 class App(tk.Tk):
+    WORD_DB_FLUSH_MS = 30000
+    LOG_FLUSH_MS = 1000
+
     def __init__(self):
         super().__init__()
         self.title("Simple Live Translator (LM Studio) - EN/JA only")
@@ -427,27 +643,82 @@ class App(tk.Tk):
 
         self.config_dict = self._load_config()
         self._init_client()
+
+        # word DB lives in memory; word.csv gets delta rows and a periodic sorted rewrite.
+        # Entries are replaced, never mutated in place, so a single word_db.get() needs
+        # no lock; _word_db_lock guards read-modify-write updates and the combobox index.
+        self.word_db = load_word_db()
+        self._word_db_lock = Lock()
+        self._word_db_dirty = False
+        self._word_db_flush_id = None        # pending debounced rewrite (Tk after id)
+        self._word_db_write_lock = Lock()    # one word.csv rewrite at a time
+        self._word_db_version = 0     # bumped on every DB change
+        self._combo_db_version = None # DB version the combobox was last built from
+        # combobox order kept incrementally: sorted (-count, word) keys + preformatted labels
+        self._word_index = sorted((-_word_count(i), w) for w, i in self.word_db.items())
+        self._word_labels = {w: f"{w} ({-c})" for c, w in self._word_index}
+        self._combo_values = None     # cached label list; None when the order changed
+        self._combo_word_map = {}     # combobox label -> word, rebuilt with the labels
+        if os.path.exists(WORD_CSV_PATH):
+            # normalize legacy layouts once so appended delta rows match WORD_HEADER
+            save_word_db_full(self.word_db, self._word_sort_top_k())
+
         self._build_ui()
 
         self.display = DisplayWindow(self); self.display.show()
         self.wordhud = WordFlash(self); self.wordhud.show()  # ← 起動時から表示
 
         self.pending = {}  # ts14 -> {"de":str, "ja":..., "en":..., "es":..., "fr":...}
+        # archive.csv stays open for the whole session (one buffered write per row)
+        self._archive_fh = None
+        self._archive_writer = None
+        self._open_archive()
+        atexit.register(self._close_archive)
+        # request/response logs: one open file per day and kind, flushed every second
+        self._log_spool = LogSpool(LOG_DIR)
+        atexit.register(self._log_spool.close_all)
+        # Word Flash captures (screen grab + PNG encode) run off the Tk thread, one at a time
+        self._png_pool = ThreadPoolExecutor(max_workers=1)
 
         # --- Queues & workers ---
-        self.sentence_q = Queue()
-        self.word_q = Queue()
+        # sentence_q is an asyncio.Queue owned by the worker event loop; word
+        # lookups are dispatched straight onto that loop (see _submit_word)
         self._current_sentence = None
         self._current_word = None
         self._cur_lock = Lock()
+        # sentence results are shown in submission order (see _apply_sentence_results)
+        self._sentence_next_seq = 0
+        self._sentence_next_apply = 0
+        self._sentence_done = {}
         # for wordflash buffer control
         self._last_wordflash_time = 0.0
-
-        threading.Thread(target=self._sentence_worker, daemon=True).start()
-        threading.Thread(target=self._word_worker_queue, daemon=True).start()
+        # fetched words waiting for their Word Flash turn (drained on the Tk thread)
+        self._flash_display_q = deque()
+        self._flash_drain_id = None
+        self._redisplay_ids = set()   # pending delayed Re-display timers
+        # identical word prompts within a session are answered from memory
+        self._ask_word_cached = functools.lru_cache(maxsize=2048)(self._respond_word)
+        # words queued or being processed; a word is never in flight twice
+        self._word_inflight = set()
+        # occurrences sent while the word was in flight; added by that word's task
+        self._word_pending_n = {}
+        self._wi_lock = Lock()
+        self._words_waiting = 0  # new words waiting for a model request (loop thread)
+
+        # UI updates posted from worker threads, applied in one Tk callback per burst
+        self._ui_ops = []
+        self._ui_lock = Lock()
+        self._ui_drain_pending = False
+
+        self._aio_ready = threading.Event()
+        threading.Thread(target=self._aio_thread, daemon=True).start()
+        self._aio_ready.wait()
 
         # periodic UI updater for queue status
+        self._last_counts = (None, None, None, None)  # (S size, W size, current S, current W)
         self._update_queue_labels()
+        self.after(self.LOG_FLUSH_MS, self._flush_logs)
+        self.protocol("WM_DELETE_WINDOW", self.on_close)
 
     # --- config ---
     def _load_config(self):
@@ -474,6 +745,10 @@ class App(tk.Tk):
             self.client_ok = True
         except Exception as e:
             print("LM Studio client init failed:", e); self.client_ok = False
+            return
+        # handles belong to the previous client; the workers rebuild them on first use
+        # (lms.llm may load the model, which must not happen on the Tk thread)
+        _get_llm.cache_clear()
 
     # --- UI ---
     def _build_ui(self):
@@ -508,7 +783,7 @@ class App(tk.Tk):
         ttk.Button(top, text="Show Word Flash Window", command=self.on_show_wordflash).grid(row=1, column=2, columnspan=2, sticky="w", padx=(6,4), pady=(6,0))
 
         # 翻訳 (EN/JA only)
-        frm_in = ttk.LabelFrame(self, text="German → EN/JA (sequenced EN→JA) — ES/FR disabled")
+        frm_in = ttk.LabelFrame(self, text="German → EN/JA (one combined EN+JA request) — ES/FR disabled")
         frm_in.pack(fill=tk.BOTH, expand=False, padx=10, pady=(6, 4))
         self.txt_in = ScrolledText(frm_in, height=4, wrap=tk.WORD)
         self.txt_in.pack(fill=tk.BOTH, expand=True, padx=6, pady=6)
@@ -543,6 +818,7 @@ class App(tk.Tk):
         ttk.Button(qfrm, text="Re-display Word", command=self.on_redisplay_word).grid(row=2, column=2, sticky="w", pady=(6,0))
         ttk.Button(qfrm, text="Skip Flash", command=self.on_toggle_skip).grid(row=2, column=3, sticky="w", pady=(6,0))
         ttk.Button(qfrm, text="Save PNG", command=self.on_save_png_for_selected).grid(row=2, column=4, sticky="w", pady=(6,0))
+        ttk.Button(qfrm, text="Re-translate", command=self.on_retranslate_word).grid(row=2, column=5, sticky="w", pady=(6,0))
 
         # Q&A
         frm_q = ttk.LabelFrame(self, text="Ask GPT-oss (general question)")
@@ -559,6 +835,10 @@ class App(tk.Tk):
 
         hint = ttk.Label(self, text="Tip: Ctrl+Enter で送信。ES/FR は現在無効化されています。", foreground="#666")
         hint.pack(side=tk.BOTTOM, pady=(0,8))
+        # non-modal validation / result messages (see _flash_status)
+        self.status_bar = ttk.Label(self, text="", anchor="w")
+        self.status_bar.pack(side=tk.BOTTOM, fill=tk.X, padx=10)
+        self._status_clear_id = None
 
         # initialize saved words list
         self.refresh_word_list()
@@ -570,7 +850,10 @@ class App(tk.Tk):
 
     def on_save(self):
         self.config_dict["SERVER_API_HOST"] = self.var_server.get().strip()
-        self.config_dict["MODEL_NAME"] = self.var_model.get().strip()
+        model_name = self.var_model.get().strip()
+        if model_name != self.config_dict.get("MODEL_NAME"):
+            _get_llm.cache_clear()  # drop handles of the previous model
+        self.config_dict["MODEL_NAME"] = model_name
         self.config_dict["TEMPERATURE"] = float(self.var_temp.get())
         self.config_dict["MAX_TOKENS"] = int(self.var_maxtok.get())
         try:
@@ -579,124 +862,455 @@ class App(tk.Tk):
         except Exception: pass
         messagebox.showinfo("Saved", "Settings saved.")
 
+    def on_close(self):
+        # drop pending timers so no callback runs against a destroyed window
+        for after_id in (self._word_db_flush_id, self._flash_drain_id, self._status_clear_id, *self._redisplay_ids):
+            if after_id is not None:
+                self.after_cancel(after_id)
+        if self._word_db_dirty:
+            self._write_word_db()
+        self._close_archive()
+        self._log_spool.close_all()
+        self.destroy()
+
+    def _flush_logs(self):
+        self._log_spool.flush_all()
+        self.after(self.LOG_FLUSH_MS, self._flush_logs)
+
+    # --- archive.csv ---
+    def _open_archive(self):
+        try:
+            ensure_dir(os.path.dirname(ARCHIVE_CSV_PATH))
+            fh = open(ARCHIVE_CSV_PATH, "a", encoding="utf-8", newline="", buffering=64*1024)
+        except Exception as e:
+            print("archive.csv open failed:", e); return
+        self._archive_fh = fh
+        self._archive_writer = csv.writer(fh)
+        if os.fstat(fh.fileno()).st_size == 0:
+            self._archive_writer.writerow(ARCHIVE_HEADER); fh.flush()
+
+    def _close_archive(self):
+        fh, self._archive_fh = self._archive_fh, None
+        if fh is not None:
+            try: fh.close()
+            except Exception: pass
+
+    def _archive_row(self, row: list):
+        if self._archive_fh is None:
+            append_csv_row(ARCHIVE_CSV_PATH, row, header=ARCHIVE_HEADER)
+            return
+        self._archive_writer.writerow(row)
+        self._archive_fh.flush()
+
     def on_reconnect(self):
         self.on_save(); self._init_client()
         if self.client_ok: messagebox.showinfo("Reconnected", "LM Studio client configured.")
         else: messagebox.showwarning("Connection", "Client not available. Check lmstudio server.")
 
+    # --- word DB persistence ---
+    def _record_word(self, word: str, info: dict) -> bool:
+        # caller holds self._word_db_lock. Returns True when the DB just became dirty:
+        # the caller then posts _schedule_word_db_flush *after* releasing the lock
+        # (_post_ui calls into Tk, which may wait on the Tk thread, which may wait
+        # on this lock in refresh_word_list)
+        old = self.word_db.get(word)
+        count = _word_count(info)
+        if old is None or _word_count(old) != count:
+            if old is not None:
+                i = bisect.bisect_left(self._word_index, (-_word_count(old), word))
+                del self._word_index[i]
+            bisect.insort(self._word_index, (-count, word))
+            self._word_labels[word] = f"{word} ({count})"
+            self._combo_values = None
+        self.word_db[word] = info
+        self._word_db_version += 1
+        append_word_delta(word, info)
+        if self._word_db_dirty:
+            return False
+        self._word_db_dirty = True
+        return True
+
+    def _word_sort_top_k(self) -> int:
+        try: return int(self.config_dict.get("WORD_SORT_TOP_K", 0) or 0)
+        except Exception: return 0
+
+    def _schedule_word_db_flush(self):
+        # debounce: at most one sorted rewrite per WORD_DB_FLUSH_MS, none while idle
+        if self._word_db_flush_id is None:
+            self._word_db_flush_id = self.after(self.WORD_DB_FLUSH_MS, self._flush_word_db)
+
+    def _flush_word_db(self):
+        self._word_db_flush_id = None
+        threading.Thread(target=self._write_word_db, daemon=True).start()
+
+    def _write_word_db(self):
+        # rewrite word.csv sorted, folding in the appended delta rows; the
+        # snapshot is taken under the DB lock but written outside it
+        reschedule = False
+        with self._word_db_write_lock:
+            tmp = WORD_CSV_PATH + ".tmp"
+            try:
+                with self._word_db_lock:
+                    snap = dict(self.word_db)
+                    self._word_db_dirty = False
+                write_word_csv(tmp, snap, self._word_sort_top_k())
+                with self._word_db_lock:
+                    # entries recorded while the snapshot was written (infos are never
+                    # mutated in place, so identity tells them apart); their delta rows
+                    # went to the file being replaced
+                    for w, i in self.word_db.items():
+                        if snap.get(w) is not i:
+                            append_csv_row(tmp, _word_row(w, i))
+                    os.replace(tmp, WORD_CSV_PATH)
+            except Exception as e:
+                print("word.csv save failed:", e)
+                with self._word_db_lock:
+                    reschedule = not self._word_db_dirty
+                    self._word_db_dirty = True
+        # posted after both locks: on_close blocks on the write lock from the Tk thread
+        if reschedule:
+            self._post_ui(self._schedule_word_db_flush)
+
     # --- queue status updater ---
     def _update_queue_labels(self):
         try:
-            self.lbl_sentence_queue.config(text=str(self.sentence_q.qsize()))
-            self.lbl_word_queue.config(text=str(self.word_q.qsize()))
+            sq = self.sentence_q.qsize()
+            wq = self._words_waiting
             with self._cur_lock:
-                self.lbl_current_sentence.config(text=self._current_sentence or "-")
-                self.lbl_current_word.config(text=self._current_word or "-")
-            # update Display window's S/W counters next to language boxes
-            try:
-                self.display.update_queue_counts(self.sentence_q.qsize(), self.word_q.qsize())
-            except Exception:
-                pass
+                cs = self._current_sentence or "-"
+                cw = self._current_word or "-"
+            last = self._last_counts
+            # only touch widgets whose value changed (avoids idle Tk redraws)
+            if (sq, wq, cs, cw) != last:
+                if sq != last[0]: self.lbl_sentence_queue.config(text=str(sq))
+                if wq != last[1]: self.lbl_word_queue.config(text=str(wq))
+                if cs != last[2]: self.lbl_current_sentence.config(text=cs)
+                if cw != last[3]: self.lbl_current_word.config(text=cw)
+                # update Display window's S/W counters next to language boxes
+                if (sq, wq) != last[:2]:
+                    try:
+                        self.display.update_queue_counts(sq, wq)
+                    except Exception:
+                        pass
+                self._last_counts = (sq, wq, cs, cw)
         except Exception:
             pass
         self.after(500, self._update_queue_labels)
 
-    # --- sentence worker (single worker ensures sequential processing) ---
-    def _sentence_worker(self):
+    # --- UI hand-off from worker threads ---
+    def _post_ui(self, op):
+        with self._ui_lock:
+            self._ui_ops.append(op)
+            if self._ui_drain_pending: return
+            self._ui_drain_pending = True
+        self.after(0, self._drain_ui)
+
+    def _drain_ui(self):
+        with self._ui_lock:
+            ops, self._ui_ops = self._ui_ops, []
+            self._ui_drain_pending = False
+        for op in ops:
+            try: op()
+            except Exception as e: print("UI update failed:", e)
+
+    # --- async workers (one event loop thread for sentences and words) ---
+    def _aio_thread(self):
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        # blocking lmstudio calls run here; sized for every slot to be busy at once
+        sentence_parallel = self._int_setting("SENTENCE_PARALLEL")
+        word_parallel = self._int_setting("WORD_PARALLEL")
+        # (daemon threads: an in-flight request must not hold up exit after on_close)
+        self._sentence_pool = DaemonPool(sentence_parallel, "sentence")
+        # word lookups get their own pool so a burst of words cannot starve sentences
+        self._word_pool = DaemonPool(2 * word_parallel, "word")
+        # created on the loop thread (pre-3.10 asyncio binds them to the current loop)
+        self.sentence_q = asyncio.Queue()
+        self._word_sem = asyncio.Semaphore(word_parallel)
+        # new words waiting to be batched; bounded, so a flood of new words waits
+        # on the loop (never on the Tk thread) instead of piling up here
+        self._word_stage = asyncio.Queue(maxsize=self._int_setting("WORD_Q_MAX"))
+        self._aio_loop = loop
+        self._aio_ready.set()
+        loop.run_until_complete(asyncio.gather(
+            self._consume(self.sentence_q, sentence_parallel, self._sentence_task),
+            self._collect_words(self._int_setting("WORD_BATCH_SIZE"),
+                                self._int_setting("WORD_BATCH_WAIT_MS") / 1000.0)))
+
+    def _int_setting(self, key: str) -> int:
+        try: return max(1, int(self.config_dict.get(key, DEFAULT_CONFIG[key])))
+        except Exception: return DEFAULT_CONFIG[key]
+
+    def _submit(self, q, task: dict):
+        # called from the Tk thread; asyncio.Queue is not thread-safe
+        self._aio_loop.call_soon_threadsafe(q.put_nowait, task)
+
+    async def _consume(self, q, limit: int, handler):
+        # take a task only when a slot is free, so qsize() still shows the backlog
+        sem = asyncio.Semaphore(limit)
+        running = set()
         while True:
-            try:
-                task = self.sentence_q.get()
-            except Exception:
-                time.sleep(0.1); continue
-            if not task:
-                self.sentence_q.task_done(); continue
-            # task: dict with keys: model_name,prompt,ts14,lang,log_path,cfg,de_text
-            model_name = task.get("model_name")
-            prompt = task.get("prompt")
-            ts14 = task.get("ts14")
-            lang = task.get("lang")
-            log_path = task.get("log_path")
-            cfg = task.get("cfg")
-            de_text = task.get("de_text")
-            # set current
-            with self._cur_lock:
-                self._current_sentence = f"{lang}:{de_text[:30]}"
-            # start status on GUI thread
-            try:
-                self.after(0, lambda l=lang: self.display.start_status(l))
-                # perform translation (blocking)
-                model = lms.llm(model_name) if model_name else lms.llm()
-                res = model.respond(prompt, config=cfg)
-                raw = res if isinstance(res, str) else getattr(res, "content", str(res))
-            except Exception as e:
-                raw = f"(error) {e}"
-            # write logs and update UI on main thread
-            write_text(log_path, raw)
-            final_text = extract_final_message_only(raw) or raw.strip()
-            self.after(0, lambda t=final_text, ts=ts14, l=lang: self._apply_translate_result(ts, l, t))
-            with self._cur_lock:
+            await sem.acquire()
+            task = await q.get()
+            fut = asyncio.ensure_future(self._run_slot(sem, handler, task))
+            running.add(fut); fut.add_done_callback(running.discard)
+
+    async def _run_slot(self, sem, handler, task: dict):
+        try:
+            if task: await handler(task)
+        except Exception as e:
+            print("worker task failed:", e)
+        finally:
+            sem.release()
+
+    # --- sentence task ---
+    async def _sentence_task(self, task: dict):
+        await asyncio.get_event_loop().run_in_executor(self._sentence_pool, self._translate_sentence, task)
+
+    def _translate_sentence(self, task: dict):
+        # task: dict with keys: model_name,prompt,ts14,lang,log_kind,cfg_key,de_text,seq
+        # lang "en+ja" means one combined request answered as "EN: ...\nJA: ..."
+        model_name = task.get("model_name")
+        prompt = task.get("prompt")
+        ts14 = task.get("ts14")
+        lang = task.get("lang")
+        log_kind = task.get("log_kind")
+        cfg_k = task.get("cfg_key")
+        de_text = task.get("de_text")
+        seq = task.get("seq")
+        # set current
+        current = f"{lang}:{de_text[:30]}"
+        with self._cur_lock:
+            self._current_sentence = current
+        langs = lang.split("+")
+        # start status on GUI thread
+        failed = False
+        try:
+            for l in langs:
+                self._post_ui(lambda l=l: self.display.start_status(l))
+            # perform translation (blocking)
+            model = _get_llm(model_name or "")
+            res = model.respond(prompt, config=dict(cfg_k))
+            raw = res if isinstance(res, str) else getattr(res, "content", str(res))
+        except Exception as e:
+            raw = f"(error) {e}"; failed = True
+        # write logs and update UI on main thread
+        self._log_spool.write(log_kind, ts14, raw)
+        final_text = extract_final_message_only(raw) or raw.strip()
+        en_ja = split_en_ja(final_text) if len(langs) == 2 and not failed else None
+        if en_ja and all(en_ja):
+            results = list(zip(langs, en_ja))
+        else:
+            # error, or an answer that could not be split: show it unsplit for both
+            # languages rather than an empty line (and an empty archive column)
+            results = [(l, final_text) for l in langs]
+        self._post_ui(lambda: self._apply_sentence_results(seq, ts14, results))
+        with self._cur_lock:
+            if self._current_sentence == current:
                 self._current_sentence = None
-            self.sentence_q.task_done()
 
-    # --- word queue worker (single worker) ---
-    def _word_worker_queue(self):
-        while True:
-            try:
-                task = self.word_q.get()
-            except Exception:
-                time.sleep(0.1); continue
-            if not task:
-                self.word_q.task_done(); continue
-            # task: dict with keys: model_name, word, cfg
-            model_name = task.get("model_name")
+    def _apply_sentence_results(self, seq: int, ts14: str, results: list):
+        # sentences run in parallel; display them in submission order
+        self._sentence_done[seq] = (ts14, results)
+        while self._sentence_next_apply in self._sentence_done:
+            ts, res = self._sentence_done.pop(self._sentence_next_apply)
+            self._sentence_next_apply += 1
+            for l, t in res:
+                self._apply_translate_result(ts, l, t)
+
+    # --- word task ---
+    def _submit_word(self, task: dict):
+        # called from the Tk thread; no queue hop, only words that need the model are staged
+        asyncio.run_coroutine_threadsafe(self._word_task(task), self._aio_loop)
+
+    async def _word_task(self, task: dict):
+        try:
+            await self._process_word(task)
+        except Exception as e:
+            print("worker task failed:", e)
+        finally:
             word = task.get("word")
-            cfg = task.get("cfg")
-            # set current
-            with self._cur_lock:
-                self._current_word = word
+            with self._wi_lock:
+                self._word_inflight.discard(word)
+                late = self._word_pending_n.pop(word, 0)
+            if late:
+                # occurrences that arrived after the task's DB update
+                flush = False
+                with self._word_db_lock:
+                    info = self.word_db.get(word)
+                    if info:
+                        flush = self._record_word(word, dict(info, count=int(info.get("count", 0)) + late))
+                if flush: self._post_ui(self._schedule_word_db_flush)
+                self._post_ui(self.refresh_word_list)
+
+    def _take_pending_n(self, word: str) -> int:
+        with self._wi_lock:
+            return self._word_pending_n.pop(word, 0)
+
+    async def _process_word(self, task: dict):
+        # task: dict with keys: model_name, word, cfg_key[, n, force]
+        model_name = task.get("model_name")
+        word = task.get("word")
+        cfg_k = task.get("cfg_key")
+        # force: manual Re-translate, always asks the model and does not count as an occurrence
+        force = task.get("force", False)
+        n = 0 if force else task.get("n", 1)  # occurrences in the sent text
+        # skip==1 words are never flashed: just count them, no LLM round-trips
+        prev_info = self.word_db.get(word)
+        if not force and prev_info and int(prev_info.get("skip", 0)) == 1:
+            with self._word_db_lock:
+                n += self._take_pending_n(word)
+                prev_info = self.word_db.get(word, prev_info)
+                flush = self._record_word(word, dict(prev_info, count=int(prev_info.get("count", 0)) + n))
+            if flush: self._post_ui(self._schedule_word_db_flush)
+            self._post_ui(self.refresh_word_list)
+            return
+        cached = prev_info if not force and prev_info and has_translation(prev_info) else None
+        # set current
+        with self._cur_lock:
+            self._current_word = word
+        if cached:
+            # known word: reuse the stored translations instead of asking again
+            en, ja = cached["en"], cached["ja"]
+        else:
             try:
-                # perform two sub-requests (en, ja)
-                en = self._ask_word(model_name, prompt_word_en(word), cfg)
-                ja = self._ask_word(model_name, prompt_word_ja(word), cfg)
+                en, ja = await self._lookup_word(model_name, word, cfg_k, force)
             except Exception as e:
                 en = f"(error) {e}"; ja = ""
-            # update DB (increment count)
-            db = load_word_db()
-            prev = int(db.get(word, {}).get("count", 0))
-            sk = int(db.get(word, {}).get("skip", 0))
-            db[word] = {"en": en, "ja": ja, "count": prev + 1, "skip": sk}
-            save_word_db(db)
-            count_now = prev + 1
-
-            # ensure 2s buffer since last wordflash display
-            now_t = time.time()
-            elapsed = now_t - self._last_wordflash_time
-            if elapsed < 2.0:
-                time.sleep(2.0 - elapsed)
-            self._last_wordflash_time = time.time()
+        # update DB (increment count)
+        flush = False
+        with self._word_db_lock:
+            # plus any occurrences sent while this lookup was running
+            n += self._take_pending_n(word)
+            prev_info = self.word_db.get(word, {})
+            prev = int(prev_info.get("count", 0))
+            sk = int(prev_info.get("skip", 0))
+            count_now = prev + n
+            if not force or has_translation({"en": en, "ja": ja}):
+                flush = self._record_word(word, {"en": en, "ja": ja, "count": count_now, "skip": sk})
+            elif n and prev_info:
+                # a failed Re-translate keeps the stored translations, but still counts
+                flush = self._record_word(word, dict(prev_info, count=count_now))
+        if flush:
+            self._post_ui(self._schedule_word_db_flush)
+
+        # hand over to the paced Word Flash display unless skip flag is set;
+        # this task (and its LLM slot) does not wait for the 2s spacing
+        if sk == 0 or force:
+            self._flash_display_q.append((count_now, word, en, ja, prev == 0))
+            self._post_ui(self._kick_flash_q)
+
+        # refresh word combobox in main thread
+        self._post_ui(self.refresh_word_list)
+
+        with self._cur_lock:
+            if self._current_word == word:
+                self._current_word = None
 
-            # show on UI thread unless skip flag is set
-            if int(db[word].get("skip",0)) == 0:
-                # normal automatic display (no star)
-                self.after(0, lambda c=count_now, de=word, e=en, j=ja: self.wordhud.show_word(c, de, e, j, starred=False))
-                # if this is the first time (count_now == 1), save PNG automatically
-                if count_now == 1:
-                    try:
-                        self._save_wordflash_png(de=word)
-                    except Exception:
-                        pass
-            else:
-                # skip==1: do not display automatically
+    async def _lookup_word(self, model_name: str, word: str, cfg_k: tuple, force: bool):
+        # staged for _collect_words; resolves to (en, ja)
+        fut = asyncio.get_event_loop().create_future()
+        self._words_waiting += 1
+        await self._word_stage.put((model_name, cfg_k, word, force, fut))
+        return await fut
+
+    async def _collect_words(self, batch_size: int, wait_s: float):
+        # group staged words into batches of up to batch_size, waiting at most
+        # wait_s after the first one for the rest of a sentence's words to arrive.
+        # A request slot is taken before the rest of a batch leaves the stage, so a
+        # backlog stays in the bounded stage (WORD_Q_MAX) instead of piling up as
+        # batch tasks. (Not before the first get: an idle collector must not sit on
+        # a slot that a word falling back to a single request is waiting for.)
+        stage = self._word_stage
+        sem = self._word_sem
+        running = set()
+        while True:
+            batch = [await stage.get()]
+            await sem.acquire()
+            if stage.qsize() + 1 < batch_size:
+                await asyncio.sleep(wait_s)
+            while len(batch) < batch_size and not stage.empty():
+                batch.append(stage.get_nowait())
+            groups = {}
+            for item in batch:
+                groups.setdefault(item[:2], []).append(item)
+            for i, ((model_name, cfg_k), items) in enumerate(groups.items()):
+                if i: await sem.acquire()  # each further (model, cfg) group needs its own slot
+                fut = asyncio.ensure_future(self._run_word_batch(model_name, cfg_k, items))
+                running.add(fut); fut.add_done_callback(running.discard)
+
+    async def _run_word_batch(self, model_name: str, cfg_k: tuple, items: list):
+        # runs on a request slot taken by _collect_words, released once the batch
+        # request is done; words it did not answer are then asked one by one
+        loop = asyncio.get_event_loop()
+        self._words_waiting -= len(items)
+        found = {}
+        try:
+            if len(items) == 1:
+                await self._ask_word_pair(model_name, cfg_k, items[0])
+                return
+            try:
+                words = tuple(item[2] for item in items)
+                found = await loop.run_in_executor(self._word_pool, self._ask_words_batch, model_name, words, cfg_k)
+            except Exception as e:
+                print("word batch failed:", e)
+        finally:
+            self._word_sem.release()
+        rest = []
+        for item in items:
+            if item[2] in found:
+                if not item[4].done(): item[4].set_result(found[item[2]])
+            else: rest.append(item)
+        self._words_waiting += len(rest)
+        await asyncio.gather(*(self._word_pair(model_name, cfg_k, item) for item in rest))
+
+    async def _word_pair(self, model_name: str, cfg_k: tuple, item: tuple):
+        async with self._word_sem:
+            self._words_waiting -= 1
+            await self._ask_word_pair(model_name, cfg_k, item)
+
+    async def _ask_word_pair(self, model_name: str, cfg_k: tuple, item: tuple):
+        # caller holds a request slot; two sub-requests (en, ja) concurrently
+        _, _, word, force, fut = item
+        loop = asyncio.get_event_loop()
+        try:
+            fut.set_result(tuple(await asyncio.gather(
+                loop.run_in_executor(self._word_pool, self._ask_word, model_name, prompt_word_en(word), cfg_k, force),
+                loop.run_in_executor(self._word_pool, self._ask_word, model_name, prompt_word_ja(word), cfg_k, force))))
+        except Exception as e:
+            if not fut.done(): fut.set_exception(e)
+
+    def _ask_words_batch(self, model_name: str, words: tuple, cfg_k: tuple) -> dict:
+        model = _get_llm(model_name or "")
+        res = model.respond(prompt_words_batch(words), config=dict(cfg_k))
+        raw = res if isinstance(res, str) else getattr(res, "content", str(res))
+        return parse_words_batch(extract_final_message_only(raw) or raw, words)
+
+    # --- Word Flash display pacing (Tk thread) ---
+    def _kick_flash_q(self):
+        if self._flash_drain_id is None:
+            self._drain_flash_q()
+
+    def _drain_flash_q(self):
+        # show one queued word, keeping a 2s buffer since the last wordflash display
+        self._flash_drain_id = None
+        if not self._flash_display_q: return
+        wait = 2.0 - (time.time() - self._last_wordflash_time)
+        if wait > 0:
+            self._flash_drain_id = self.after(int(wait * 1000) + 1, self._drain_flash_q)
+            return
+        count_now, word, en, ja, first = self._flash_display_q.popleft()
+        self._last_wordflash_time = time.time()
+        # normal automatic display (no star)
+        self.wordhud.show_word(count_now, word, en, ja, starred=False)
+        # if this is the first time the word is seen, save PNG automatically
+        if first:
+            try:
+                self._save_wordflash_png(de=word)
+            except Exception:
                 pass
-
-            # refresh word combobox in main thread
-            self.after(0, self.refresh_word_list)
-
-            with self._cur_lock:
-                self._current_word = None
-            self.word_q.task_done()
-            # small gap to keep loop responsive
-            time.sleep(0.25)
+        if self._flash_display_q:
+            self._flash_drain_id = self.after(2000, self._drain_flash_q)
 
     # --- translate sequence (enqueue only EN and JA) ---
     def on_send_translate(self):
@@ -705,27 +1319,15 @@ class App(tk.Tk):
             return
         text = self.txt_in.get("1.0", tk.END).strip()
         if not text:
-            messagebox.showwarning("Input", "Please enter German text.")
+            self._flash_status("Please enter German text.", "warn")
             return
 
         now = tz_now_jst()
-        ts_hm  = now.strftime("%H:%M")
-        ts12   = now.strftime("%y%m%d%H%M%S")
-        ts14   = now.strftime("%Y%m%d%H%M%S")
-        ymd    = now.strftime("%Y%m%d")
-
-        day_dir = os.path.join(os.path.dirname(__file__), "log", ymd)
-        ensure_dir(day_dir)
-        f_input = os.path.join(day_dir, f"{ts12}_001_Input.log")
-        f_ja    = os.path.join(day_dir, f"{ts12}_002_Japanese.log")
-        f_en    = os.path.join(day_dir, f"{ts12}_003_English.log")
-        # ES/FR logs left for compatibility but will not be used
-        f_es    = os.path.join(day_dir, f"{ts12}_004_Spanish.log")
-        f_fr    = os.path.join(day_dir, f"{ts12}_005_French.log")
-        archive = os.path.join(os.path.dirname(__file__), "log", "archive.csv")
-
-        p_en = prompt_en(text); p_ja = prompt_ja(text)
-        write_text(f_input, f"[{ts14}] INPUT: {text}\n\n[ENGLISH]\n{p_en}\n\n[JAPANESE]\n{p_ja}\n")
+        ts14   = now.strftime("%Y%m%d%H%M%S")  # one strftime; the other stamps are slices
+        ts_hm  = f"{ts14[8:10]}:{ts14[10:12]}"
+
+        p_en_ja = prompt_en_ja(text)
+        self._log_spool.write("001_Input", ts14, f"[{ts14}] INPUT: {text}\n\n[ENGLISH+JAPANESE]\n{p_en_ja}")
 
         # UI display initial
         self.display.append_line("───", tag="in")
@@ -734,36 +1336,32 @@ class App(tk.Tk):
         # pending record for archiving; keep es/fr as None but ES/FR are disabled
         self.pending[ts14] = {"de": text, "ja": None, "en": None, "es": None, "fr": None}
 
-        cfg = {"temperature": float(self.var_temp.get())}
-        mt_val = int(self.var_maxtok.get())
-        if mt_val > 0: cfg["maxTokens"] = mt_val
+        cfg_k = cfg_key(float(self.var_temp.get()), int(self.var_maxtok.get()))
         model_name = (self.var_model.get().strip() or self.config_dict.get("MODEL_NAME"))
 
-        # Enqueue EN then JA to preserve sequence
-        self.sentence_q.put({
+        # Enqueue a single EN+JA request (one prefill of the German text)
+        self._submit(self.sentence_q, {
             "model_name": model_name,
-            "prompt": p_en,
+            "prompt": p_en_ja,
             "ts14": ts14,
-            "lang": "en",
-            "log_path": f_en,
-            "cfg": cfg,
-            "de_text": text
+            "lang": "en+ja",
+            "log_kind": "002_EnJa",
+            "cfg_key": cfg_k,
+            "de_text": text,
+            "seq": self._sentence_next_seq
         })
-        self.sentence_q.put({
-            "model_name": model_name,
-            "prompt": p_ja,
-            "ts14": ts14,
-            "lang": "ja",
-            "log_path": f_ja,
-            "cfg": cfg,
-            "de_text": text
-        })
-
-        # enqueue word translations to word_q (tokenize and queue)
-        words = tokenize_german(text)
-        if words:
-            for w in words:
-                self.word_q.put({"model_name": model_name, "word": w, "cfg": cfg})
+        self._sentence_next_seq += 1
+
+        # dispatch word translations (tokenize and submit)
+        # one task per distinct word, carrying how often it occurs in this text
+        for w, n in Counter(tokenize_german(text)).items():
+            with self._wi_lock:
+                if w in self._word_inflight:
+                    # only the lookup is deduplicated; the running task adds these occurrences
+                    self._word_pending_n[w] = self._word_pending_n.get(w, 0) + n
+                    continue
+                self._word_inflight.add(w)
+            self._submit_word({"model_name": model_name, "word": w, "cfg_key": cfg_k, "n": n})
 
     def _apply_translate_result(self, ts14: str, lang: str, text: str):
         # mark done status (this will be called from main thread via after)
@@ -777,19 +1375,23 @@ class App(tk.Tk):
             # since es/fr disabled, archive when en & ja present
             if all(d.get(k) is not None for k in ("ja","en")):
                 row = [ts14, d["de"], d["ja"], d["en"], d.get("es") or "", d.get("fr") or ""]
-                append_csv_row(os.path.join(os.path.dirname(__file__), "log", "archive.csv"),
-                               row,
-                               header=["Time","Germany","Japanese","English","Spanish","French"])
+                self._archive_row(row)
                 self.pending.pop(ts14, None)
 
-    # --- Word flow legacy removed; now handled via queue worker using _ask_word ---
-    def _ask_word(self, model_name: str, prompt: str, cfg: dict) -> str:
+    # --- word lookups (blocking; run on the word pool, see _collect_words) ---
+    def _ask_word(self, model_name: str, prompt: str, cfg_k: tuple, fresh: bool = False) -> str:
         try:
-            model = lms.llm(model_name) if model_name else lms.llm()
-            res = model.respond(prompt, config=cfg)
-            raw = res if isinstance(res, str) else getattr(res, "content", str(res))
+            if fresh:
+                return self._respond_word(model_name, prompt, cfg_k)
+            return self._ask_word_cached(model_name, prompt, cfg_k)
         except Exception as e:
-            raw = f"(error) {e}"
+            return f"(error) {e}"
+
+    def _respond_word(self, model_name: str, prompt: str, cfg_k: tuple) -> str:
+        # raises on failure so that errors are never memoized by _ask_word_cached
+        model = _get_llm(model_name or "")
+        res = model.respond(prompt, config=dict(cfg_k))
+        raw = res if isinstance(res, str) else getattr(res, "content", str(res))
         return extract_final_message_only(raw) or ""
 
     # --- refresh combobox of saved words ---
@@ -797,48 +1399,65 @@ class App(tk.Tk):
         """
         Updated: show combobox items as "word (count)".
         The selected value is preserved where possible.
+        Skipped entirely when the DB has not changed since the last build.
         """
-        db = load_word_db()
-        # build list of "word (count)" strings sorted by count desc then word
-        values = [f"{w} ({int(db[w].get('count',0))})" for w in sorted(db.keys(), key=lambda x: (-db[x].get("count",0), x))]
+        with self._word_db_lock:
+            if self._combo_db_version == self._word_db_version:
+                return
+            self._combo_db_version = self._word_db_version
+            if self._combo_values is not None:
+                return  # e.g. a skip toggle: labels and order unchanged
+            # "word (count)" labels in (-count, word) order, no re-sort or re-format
+            labels = self._word_labels
+            # preserve selection: look up the selected word's new label
+            sel = labels.get(self._selected_word())
+            words = [w for _, w in self._word_index]
+            values = self._combo_values = [labels[w] for w in words]
+            self._combo_word_map = dict(zip(values, words))
         try:
-            cur = self.word_combo.get()
             self.word_combo['values'] = values
-            # try to preserve selection: if cur is "word (n)" or "word", find matching item
-            if cur:
-                base = cur
-                if " (" in cur and cur.endswith(")"):
-                    base = cur.rsplit(" (", 1)[0]
-                for v in values:
-                    if v.startswith(base + " (") or v == base:
-                        self.word_combo.set(v)
-                        break
+            if sel is not None:
+                self.word_combo.set(sel)
         except Exception:
             pass
 
+    def _selected_word(self) -> str:
+        # combobox labels map straight to their word; typed text may be "word (count)" or "word"
+        sel = (self.word_combo.get() or "").strip()
+        word = self._combo_word_map.get(sel)
+        if word is not None:
+            return word
+        if " (" in sel and sel.endswith(")"):
+            sel = sel.rsplit(" (", 1)[0].strip()
+        return sel
+
+    STATUS_COLORS = {"info": "#666", "warn": "#B36B00", "error": "#C00000"}
+
+    def _flash_status(self, msg: str, level: str = "info"):
+        # show msg in the status bar for 3s instead of a modal messagebox
+        self.status_bar.config(text=msg, foreground=self.STATUS_COLORS.get(level, "#666"))
+        if self._status_clear_id is not None:
+            self.after_cancel(self._status_clear_id)
+        self._status_clear_id = self.after(3000, self._clear_status)
+
+    def _clear_status(self):
+        self._status_clear_id = None
+        self.status_bar.config(text="")
+
     # --- re-display selected word (no count change) ---
     def on_redisplay_word(self):
         """
         Re-display selected word regardless of skip.
         Show ★ before count ONLY when the word's skip flag == 1.
         """
-        sel_raw = (self.word_combo.get() or "").strip()
-        if not sel_raw:
-            messagebox.showinfo("Re-display", "Please choose a saved word to re-display.")
-            return
-        # sel_raw may be "word (count)" or just "word"
-        if " (" in sel_raw and sel_raw.endswith(")"):
-            word = sel_raw.rsplit(" (", 1)[0].strip()
-        else:
-            word = sel_raw
+        word = self._selected_word()
         if not word:
-            messagebox.showinfo("Re-display", "Please choose a valid saved word.")
+            self._flash_status("Please choose a saved word to re-display.", "warn")
             return
 
-        db = load_word_db()
-        info = db.get(word)
+        info = self.word_db.get(word)
         if not info:
-            messagebox.showerror("Re-display", f"No data for '{word}'.")
+            self._flash_status(f"No data for '{word}'.", "warn")
             return
 
         en = info.get("en", "")
@@ -860,110 +1479,114 @@ class App(tk.Tk):
         # ★は skip==1 のときだけ
         starred = (skip_flag == 1)
 
-        # buffer: if last wordflash <2s ago, schedule delayed display in background
+        # buffer: if last wordflash <2s ago, schedule a delayed display on the Tk timer
         now_t = time.time()
         elapsed = now_t - self._last_wordflash_time
         if elapsed < 2.0:
+            # reserve the slot so later displays keep their 2s buffer after this one
+            self._last_wordflash_time = now_t + (2.0 - elapsed)
             def _delayed_show():
-                time.sleep(2.0 - elapsed)
-                self._last_wordflash_time = time.time()
+                self._redisplay_ids.discard(after_id)
                 # starred determined by skip flag
-                self.after(0, lambda c=cnt, de=word, e=en, j=ja, s=starred: self.wordhud.show_word(c, de, e, j, starred=s))
-            threading.Thread(target=_delayed_show, daemon=True).start()
+                self.wordhud.show_word(cnt, word, en, ja, starred=starred)
+            after_id = self.after(max(0, int((2.0 - elapsed) * 1000)), _delayed_show)
+            self._redisplay_ids.add(after_id)
         else:
             self._last_wordflash_time = time.time()
             self.wordhud.show_word(cnt, word, en, ja, starred=starred)
 
+    # --- re-translate selected word (bypasses the stored translation) ---
+    def on_retranslate_word(self):
+        if not self.client_ok or lms is None:
+            messagebox.showerror("Client", "lmstudio client not available.")
+            return
+        word = self._selected_word()
+        if not word:
+            self._flash_status("Please choose a saved word to re-translate.", "warn")
+            return
+        if word not in self.word_db:
+            self._flash_status(f"No data for '{word}'.", "warn")
+            return
+        with self._wi_lock:
+            busy = word in self._word_inflight
+            if not busy:
+                self._word_inflight.add(word)
+        if busy:
+            self._flash_status(f"'{word}' is already being translated.")
+            return
+        cfg_k = cfg_key(float(self.var_temp.get()), int(self.var_maxtok.get()))
+        model_name = (self.var_model.get().strip() or self.config_dict.get("MODEL_NAME"))
+        self._submit_word({"model_name": model_name, "word": word, "cfg_key": cfg_k, "force": True})
+
     # --- toggle skip flag for selected word ---
     def on_toggle_skip(self):
-        sel_raw = (self.word_combo.get() or "").strip()
-        if not sel_raw:
-            messagebox.showinfo("Skip Flash", "Please choose a saved word to toggle skip.")
-            return
-        if " (" in sel_raw and sel_raw.endswith(")"):
-            word = sel_raw.rsplit(" (", 1)[0].strip()
-        else:
-            word = sel_raw
+        word = self._selected_word()
         if not word:
-            messagebox.showinfo("Skip Flash", "Please choose a valid saved word.")
+            self._flash_status("Please choose a saved word to toggle skip.", "warn")
             return
-        db = load_word_db()
-        info = db.get(word)
+        with self._word_db_lock:
+            info = self.word_db.get(word)
+            if info:
+                cur = int(info.get("skip",0))
+                new = 0 if cur==1 else 1
+                flush = self._record_word(word, dict(info, skip=new))
         if not info:
-            messagebox.showerror("Skip Flash", f"No data for '{word}'.")
+            self._flash_status(f"No data for '{word}'.", "warn")
             return
-        cur = int(info.get("skip",0))
-        new = 0 if cur==1 else 1
-        info["skip"] = new
-        db[word] = info
-        save_word_db(db)
-        self.refresh_word_list()
-        messagebox.showinfo("Skip Flash", f"'{word}' skip set to {new}.")
+        if flush: self._schedule_word_db_flush()  # already on the Tk thread
+        # the skip flag is not part of the combobox labels or order: nothing to refresh
+        self._flash_status(f"'{word}' skip set to {new}.")
 
     # --- save PNG for selected word (manual) ---
     def on_save_png_for_selected(self):
-        sel_raw = (self.word_combo.get() or "").strip()
-        if not sel_raw:
-            messagebox.showinfo("Save PNG", "Please choose a saved word to save PNG.")
-            return
-        if " (" in sel_raw and sel_raw.endswith(")"):
-            word = sel_raw.rsplit(" (", 1)[0].strip()
-        else:
-            word = sel_raw
+        word = self._selected_word()
         if not word:
-            messagebox.showinfo("Save PNG", "Please choose a valid saved word.")
+            self._flash_status("Please choose a saved word to save PNG.", "warn")
             return
         try:
-            self._save_wordflash_png(de=word)
-            messagebox.showinfo("Save PNG", f"Saved WordFlash PNG for '{word}'.")
+            fut = self._save_wordflash_png(de=word)
         except Exception as e:
             messagebox.showerror("Save PNG", f"Failed to save PNG: {e}")
+            return
+        def _done(f):
+            e = f.exception()
+            if e is None:
+                self._post_ui(lambda: self._flash_status(f"Saved WordFlash PNG for '{word}'."))
+            else:
+                self._post_ui(lambda: messagebox.showerror("Save PNG", f"Failed to save PNG: {e}"))
+        fut.add_done_callback(_done)
 
     def _save_wordflash_png(self, de: str):
         """
         Capture WordFlash window and save PNG to log/FlashPNG/yyyyMMdd/(sanitized_word).png
+        The window geometry is read here (Tk thread); the screen grab, encoding and
+        writing run on the PNG pool. Returns the Future of the save, which yields the path.
         """
         now = tz_now_jst()
         ymd = now.strftime("%Y%m%d")
-        out_dir = os.path.join(os.path.dirname(__file__), "log", "FlashPNG", ymd)
+        out_dir = os.path.join(FLASH_PNG_DIR, ymd)
         ensure_dir(out_dir)
         filename = sanitize_filename(de)[:120] + ".png"
         path = os.path.join(out_dir, filename)
-        # attempt to capture via PIL.ImageGrab using window geometry
-        try:
-            if ImageGrab is None:
-                raise RuntimeError("Pillow ImageGrab not available")
-            # ensure window is visible and updated
-            self.wordhud.update_idletasks()
-            x = self.wordhud.winfo_rootx()
-            y = self.wordhud.winfo_rooty()
-            w = self.wordhud.winfo_width()
-            h = self.wordhud.winfo_height()
-            if w <=0 or h <=0:
-                raise RuntimeError("WordFlash window size invalid")
-            bbox = (x, y, x + w, y + h)
+        # capture via PIL.ImageGrab using window geometry
+        if ImageGrab is None:
+            raise RuntimeError("Pillow ImageGrab not available")
+        # ensure window is visible and updated
+        self.wordhud.update_idletasks()
+        x = self.wordhud.winfo_rootx()
+        y = self.wordhud.winfo_rooty()
+        w = self.wordhud.winfo_width()
+        h = self.wordhud.winfo_height()
+        if w <=0 or h <=0:
+            raise RuntimeError("WordFlash window size invalid")
+        bbox = (x, y, x + w, y + h)
+        def _grab_and_write():
+            # ImageGrab reads the screen, not Tk, so it can run here while the word is shown
             img = ImageGrab.grab(bbox=bbox)
-            img.save(path)
+            # fast zlib level: these are small screen grabs, saved often during auto-save
+            img.save(path, optimize=False, compress_level=1)
             return path
-        except Exception as e:
-            # fallback: try to capture the two canvases as postscript and convert if PIL available
-            try:
-                # create an image by rendering the canvases to postscript and converting
-                ps_path = os.path.join(out_dir, sanitize_filename(de)[:120] + ".ps")
-                # attempt to grab en_canvas postscript and combine... (best-effort)
-                self.wordhud.update_idletasks()
-                en_ps = self.wordhud.en_canvas.postscript(colormode='color')
-                # try to convert en_ps to image if PIL present
-                if Image is None:
-                    raise RuntimeError("PIL not available to convert postscript")
-                from io import BytesIO
-                # NOTE: PIL cannot directly open a Postscript string without external tools;
-                # this fallback is best-effort and may fail on many systems.
-                img_en = Image.open(BytesIO(en_ps.encode('utf-8')))
-                img_en.save(path)
-                return path
-            except Exception as e2:
-                raise RuntimeError(f"PNG save failed: {e}; fallback failed: {e2}")
+        return self._png_pool.submit(_grab_and_write)
 
     # --- Q&A ---
     def on_send_ask(self):
@@ -971,40 +1594,32 @@ class App(tk.Tk):
             messagebox.showerror("Client", "lmstudio client not available."); return
         q = self.txt_ask.get("1.0", tk.END).strip()
         if not q:
-            messagebox.showwarning("Input", "Please enter a question."); return
+            self._flash_status("Please enter a question.", "warn"); return
 
         now = tz_now_jst()
-        ts_hm  = now.strftime("%H:%M")
-        ts12   = now.strftime("%y%m%d%H%M%S")
-        ts14   = now.strftime("%Y%m%d%H%M%S")
-        ymd    = now.strftime("%Y%m%d")
+        ts14   = now.strftime("%Y%m%d%H%M%S")  # one strftime; the other stamps are slices
+        ts_hm  = f"{ts14[8:10]}:{ts14[10:12]}"
 
         self.display.append_line(f"{ts_hm} : {q}", tag="qa_in")
 
-        day_dir = os.path.join(os.path.dirname(__file__), "log", ymd)
-        ensure_dir(day_dir)
-        f_q = os.path.join(day_dir, f"{ts12}_006_Question.log")
-        f_a = os.path.join(day_dir, f"{ts12}_007_Answer.log")
-        write_text(f_q, q)
+        self._log_spool.write("006_Question", ts14, q)
 
         self.display.start_status("ja")
 
-        cfg = {"temperature": float(self.var_temp.get())}
-        mt_val = int(self.var_maxtok.get())
-        if mt_val > 0: cfg["maxTokens"] = mt_val
+        cfg_k = cfg_key(float(self.var_temp.get()), int(self.var_maxtok.get()))
         model_name = (self.var_model.get().strip() or self.config_dict.get("MODEL_NAME"))
-        threading.Thread(target=self._ask_worker, args=(model_name, q, cfg, f_a), daemon=True).start()
+        threading.Thread(target=self._ask_worker, args=(model_name, q, cfg_k, ts14), daemon=True).start()
 
-    def _ask_worker(self, model_name: str, prompt: str, cfg: dict, log_path: str):
+    def _ask_worker(self, model_name: str, prompt: str, cfg_k: tuple, ts14: str):
         try:
-            model = lms.llm(model_name) if model_name else lms.llm()
-            res = model.respond(prompt, config=cfg)
+            model = _get_llm(model_name or "")
+            res = model.respond(prompt, config=dict(cfg_k))
             raw = res if isinstance(res, str) else getattr(res, "content", str(res))
         except Exception as e:
             raw = f"(error) {e}"
-        write_text(log_path, raw)
+        self._log_spool.write("007_Answer", ts14, raw)
         final_text = extract_final_message_only(raw) or raw.strip()
-        self.after(0, lambda: self._apply_ask_result(final_text))
+        self._post_ui(lambda: self._apply_ask_result(final_text))
 
     def _apply_ask_result(self, text: str):
         self.display.done_status("ja")